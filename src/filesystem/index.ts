@@ -8,6 +8,7 @@ import {
   ToolSchema,
 } from "@modelcontextprotocol/sdk/types.js";
 import fs from "fs/promises";
+import { randomUUID } from "crypto";
 import path from "path";
 import os from 'os';
 import { z } from "zod";
@@ -168,6 +169,59 @@ async function getFileStats(filePath: string): Promise<FileInfo> {
   };
 }
 
+// Errors for which a temp file cannot be created or renamed into place
+// (read-only directory, bind-mounted target); write in place instead
+const IN_PLACE_FALLBACK_CODES = new Set(["EACCES", "EPERM", "EBUSY"]);
+
+async function writeFileAtomic(filePath: string, content: string): Promise<void> {
+  let mode: number | undefined;
+  try {
+    const stats = await fs.lstat(filePath);
+    // Renaming over the target would replace a symlink with a regular file
+    // or detach the target from its other hard links
+    if (stats.isSymbolicLink() || stats.nlink > 1) {
+      await fs.writeFile(filePath, content, "utf-8");
+      return;
+    }
+    mode = stats.mode & 0o7777;
+  } catch (error) {
+    if ((error as NodeJS.ErrnoException).code !== "ENOENT") {
+      throw error;
+    }
+    // Target does not exist yet; keep the default mode
+  }
+
+  // Write to a uniquely named temp file in the same directory and rename it
+  // over the target so a failed write never leaves a truncated file behind.
+  // The "wx" flag refuses to open an existing name, so a pre-planted symlink
+  // is never followed.
+  const tempPath = path.join(path.dirname(filePath), `.${randomUUID()}.tmp`);
+  let created = false;
+  try {
+    const handle = await fs.open(tempPath, "wx");
+    created = true;
+    try {
+      await handle.writeFile(content, "utf-8");
+      if (mode !== undefined) {
+        await handle.chmod(mode);
+      }
+    } finally {
+      await handle.close();
+    }
+    await fs.rename(tempPath, filePath);
+  } catch (error) {
+    if (created) {
+      await fs.rm(tempPath, { force: true }).catch(() => {});
+    }
+    const code = (error as NodeJS.ErrnoException).code;
+    if (code && IN_PLACE_FALLBACK_CODES.has(code)) {
+      await fs.writeFile(filePath, content, "utf-8");
+      return;
+    }
+    throw error;
+  }
+}
+
 async function searchFiles(
   rootPath: string,
   pattern: string,
@@ -340,7 +394,7 @@ server.setRequestHandler(CallToolRequestSchema, async (request) => {
           throw new Error(`Invalid arguments for write_file: ${parsed.error}`);
         }
         const validPath = await validatePath(parsed.data.path);
-        await fs.writeFile(validPath, parsed.data.content, "utf-8");
+        await writeFileAtomic(validPath, parsed.data.content);
         return {
           content: [{ type: "text", text: `Successfully wrote to ${parsed.data.path}` }],
         };